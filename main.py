@@ -6,12 +6,13 @@ from urllib.parse import urljoin
 
 import arrow
 import requests
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 import settings
 from clients.redis import RedisClient
 from constants import ERROR_MESSAGE_INTEGER_REQUIRED
 from logging_config.logging_config import LOGGING_CONFIG
+from profiling import run_traced, run_profiled, get_slow_stages_summary
 from single_version import create_schedules
 from utils import trigger_schedule, send_classes_report_email, get_next_week_schedules
 
@@ -39,19 +40,49 @@ async def root():
 
 
 @app.post("/schedule/{class_id}")
-async def schedule_by_id(class_id: int):
-    """Starts checking schedules from a specific class ID."""
+async def schedule_by_id(
+    class_id: int, response: Response, trace: bool = False, profile: bool = False
+):
+    """Starts checking schedules from a specific class ID.
+
+    With `trace` (or TRACE_STAGES) stage timings are collected and, when the run
+    is synchronous, returned in a Server-Timing header. With `profile` the run is
+    always synchronous and a cProfile report is returned with the schedule.
+    """
     if class_id < 0:
         return {"error": ERROR_MESSAGE_INTEGER_REQUIRED}
 
+    trace = trace or settings.TRACE_STAGES
+
+    if profile:
+        (_success, schedule), stage_trace, report = await run_profiled(
+            class_id, create_schedules(class_id=class_id)
+        )
+        response.headers["Server-Timing"] = stage_trace.server_timing()
+        return {"schedule": schedule, "stages": stage_trace.stages, "profile": report}
+
     if not settings.ASYNC_MODE:
-        _success, schedule = await create_schedules(class_id=class_id)
+        if not trace:
+            _success, schedule = await create_schedules(class_id=class_id)
+            return schedule
+
+        (_success, schedule), stage_trace = await run_traced(
+            class_id, create_schedules(class_id=class_id)
+        )
+        response.headers["Server-Timing"] = stage_trace.server_timing()
         return schedule
 
-    asyncio.create_task(create_schedules(class_id=class_id))
+    coroutine = create_schedules(class_id=class_id)
+    asyncio.create_task(run_traced(class_id, coroutine) if trace else coroutine)
     return {"message": f"Schedules for class ID {class_id} successfully triggered."}
 
 
+@app.get("/schedules/slow_stages")
+async def read_slow_stages():
+    """Retrieve the rolling log of slow pipeline stages, aggregated by stage."""
+    return get_slow_stages_summary()
+
+
 @app.get("/schedules")
 async def read_schedules():
     """Retrieve all schedules."""
@@ -0,0 +1,131 @@
+"""Opt-in per-stage timing and profiling for single class ID pipeline runs."""
+
+import asyncio
+import contextvars
+import cProfile
+import io
+import logging.config
+import pstats
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import arrow
+
+import settings
+from logging_config.logging_config import LOGGING_CONFIG
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_slow_stages = deque(maxlen=settings.SLOW_STAGE_LOG_SIZE)
+# cProfile only allows one active profiler, so profiled runs are serialized.
+_profile_lock = asyncio.Lock()
+
+
+class StageTrace:
+    """Elapsed milliseconds per named stage for a single class ID run."""
+
+    def __init__(self, class_id: int):
+        self.class_id = class_id
+        self.stages = {}
+
+    def add(self, name: str, elapsed_ms: float):
+        """Accumulate the elapsed time for a stage."""
+        self.stages[name] = self.stages.get(name, 0.0) + elapsed_ms
+
+    def server_timing(self) -> str:
+        """Format the stages as a Server-Timing header value."""
+        return ", ".join(
+            f"{name};dur={elapsed_ms:.1f}" for name, elapsed_ms in self.stages.items()
+        )
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a named stage of the current trace, if any."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - start_time) * 1000)
+
+
+@contextmanager
+def trace_run(class_id: int):
+    """Collect stage timings for everything run inside the block."""
+    trace = StageTrace(class_id)
+    token = _current_trace.set(trace)
+    try:
+        with stage("total"):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        record_slow_stages(trace)
+
+
+async def run_traced(class_id: int, coro):
+    """Await a coroutine with stage tracing enabled."""
+    with trace_run(class_id) as trace:
+        result = await coro
+    return result, trace
+
+
+async def run_profiled(class_id: int, coro):
+    """Await a coroutine with stage tracing and cProfile enabled.
+
+    Other tasks running on the event loop meanwhile are included in the report.
+    """
+    async with _profile_lock:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result, trace = await run_traced(class_id, coro)
+        finally:
+            profiler.disable()
+
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(settings.PROFILE_TOP_N)
+    return result, trace, output.getvalue()
+
+
+def record_slow_stages(trace: StageTrace):
+    """Log and keep stages slower than the configured threshold."""
+    for name, elapsed_ms in trace.stages.items():
+        if elapsed_ms < settings.SLOW_STAGE_THRESHOLD_MS:
+            continue
+        logger.warning(
+            "Slow stage %s for class ID %s: %.1f ms", name, trace.class_id, elapsed_ms
+        )
+        _slow_stages.append(
+            {
+                "class_id": trace.class_id,
+                "stage": name,
+                "elapsed_ms": round(elapsed_ms, 1),
+                "datetime": str(arrow.now().datetime),
+            }
+        )
+
+
+def get_slow_stages_summary() -> dict:
+    """Aggregate the rolling slow-stage log by stage name."""
+    stages = {}
+    for entry in _slow_stages:
+        summary = stages.setdefault(
+            entry["stage"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        summary["count"] += 1
+        summary["total_ms"] += entry["elapsed_ms"]
+        summary["max_ms"] = max(summary["max_ms"], entry["elapsed_ms"])
+
+    for summary in stages.values():
+        summary["avg_ms"] = round(summary.pop("total_ms") / summary["count"], 1)
+
+    return {"stages": stages, "recent": list(_slow_stages)}
@@ -24,6 +24,12 @@ SCHEDULES_LIMIT = 500
 REQUESTS_PER_SECOND = 10
 ASYNC_MODE = True
 
+# Per-stage tracing and profiling of single class ID runs
+TRACE_STAGES = False
+SLOW_STAGE_THRESHOLD_MS = 1000
+SLOW_STAGE_LOG_SIZE = 100
+PROFILE_TOP_N = 30
+
 # Email settings (to be overridden in local.py)
 EMAIL_SENDER = None
 EMAIL_PASSWORD = None
@@ -9,6 +9,7 @@ import arrow
 import settings
 from clients.redis import RedisClient
 from logging_config.logging_config import LOGGING_CONFIG
+from profiling import stage
 from utils import (
     check_valid_html,
     check_valid_class_type,
@@ -37,32 +38,35 @@ async def parse_schedule(html, url):
     if not html:
         return {"error": "error"}
 
-    soup = BeautifulSoup(html, features="html.parser")
-    main_text = soup.find("main")
+    with stage("parse_html"):
+        soup = BeautifulSoup(html, features="html.parser")
+        main_text = soup.find("main")
 
-    if not check_valid_html(main_text):
-        return {"error": "check_valid_html"}
+        if not check_valid_html(main_text):
+            return {"error": "check_valid_html"}
 
-    date_time = soup.find("div", class_="fecha")
-    title = soup.find("div", class_="name")
+        date_time = soup.find("div", class_="fecha")
+        title = soup.find("div", class_="name")
 
     if not date_time or not title:
         return {"error": "date_time or title"}
 
     date_time_text = date_time.text
-    date_time = get_datetime_from_text(text=date_time_text)
+    with stage("parse_datetime"):
+        date_time = get_datetime_from_text(text=date_time_text)
     title_text = title.text
 
-    if not check_valid_class_type(text=title_text):
-        return {"error": "check_valid_class_type"}
+    with stage("filters"):
+        if not check_valid_class_type(text=title_text):
+            return {"error": "check_valid_class_type"}
 
-    is_valid_time, _, _ = get_valid_time(text=date_time_text)
-    if not is_valid_time:
-        return {"error": "get_valid_time"}
+        is_valid_time, _, _ = get_valid_time(text=date_time_text)
+        if not is_valid_time:
+            return {"error": "get_valid_time"}
 
-    is_valid_instructor, instructor = get_valid_instructor(text=title_text)
-    if not is_valid_instructor:
-        return {"error": "check_valid_instructor"}
+        is_valid_instructor, instructor = get_valid_instructor(text=title_text)
+        if not is_valid_instructor:
+            return {"error": "check_valid_instructor"}
 
     schedule = build_schedule(
         date_time_text=date_time_text,
@@ -85,12 +89,14 @@ async def process_schedule(session, class_id):
     }
     """
     url = settings.SCHEDULE_URL.format(class_id=class_id)
-    html = await fetch_url(session, url)
+    with stage("fetch_url"):
+        html = await fetch_url(session, url)
     schedule = await parse_schedule(html, url)
     redis_client = RedisClient()
     if schedule and "error" not in schedule:
         schedule["url"] = url
-        await redis_client.save_schedule(schedule)
+        with stage("save_schedule"):
+            await redis_client.save_schedule(schedule)
         return True, schedule
     else:
         logger.error(schedule)